@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import os, sys, time, asyncio, logging, itertools
+import os, sys, time, asyncio, heapq, logging, itertools
+from collections import deque
 from typing import Dict, Optional
 from contextlib import suppress
 
@@ -18,7 +19,6 @@ TOKEN            = os.getenv("DISCORD_TOKEN")
 GUILD_ID         = int(os.getenv("GUILD_ID", "0"))
 CHANNEL_ID       = int(os.getenv("CHANNEL_ID", "0"))
 CLEANUP_INTERVAL = int(os.getenv("CLEANUP_INTERVAL", "300"))
-PAIR_INTERVAL    = float(os.getenv("PAIR_INTERVAL", "1.0"))
 METRICS_PORT     = int(os.getenv("METRICS_PORT", "8000"))
 TIMEOUT_SECONDS  = int(os.getenv("TIMEOUT_SECONDS", "120"))
 
@@ -37,6 +37,8 @@ VOICE_SESSIONS   = Counter("voice_sessions_total", "Total voice sessions created
 ACTIVE_THREADS_G = Gauge("active_private_threads", "Active private threads")
 ACTIVE_VOICE_G   = Gauge("active_voice_channels", "Active voice channels")
 QUEUE_SIZE       = Gauge("queue_size", "Users in queue", ["type"])
+QUEUE_SIZE_TEXT  = QUEUE_SIZE.labels(type="text")   # bound once; .labels() is a dict lookup per call
+QUEUE_SIZE_VOICE = QUEUE_SIZE.labels(type="voice")
 SESSION_DURATION = Histogram("session_duration_seconds", "Length of completed sessions", buckets=[30,60,120,300,600,1800,3600])
 
 
@@ -47,56 +49,94 @@ intents.guilds = True
 bot = commands.Bot(intents=intents, command_prefix="!")
 
 # ── State ─────────────────────────────────────────────────────────────────────
+class Session:
+    """One user's half of an active pairing; slotted — two of these exist per pair."""
+    __slots__ = ("partner", "thread", "vc", "start_time", "mode", "session_id")
+
+    def __init__(self, partner: int, mode: str, session_id: str, start_time: float,
+                 thread: Optional[discord.Thread] = None, vc: Optional[discord.VoiceChannel] = None):
+        self.partner = partner
+        self.thread = thread
+        self.vc = vc
+        self.start_time = start_time
+        self.mode = mode
+        self.session_id = session_id
+
 class SessionState:
     def __init__(self):
-        self.text_queue: asyncio.Queue[int] = asyncio.Queue()
-        self.voice_queue: asyncio.Queue[int] = asyncio.Queue()
+        # Plain deques: producers and the pairers all live on one event loop
+        # and nothing blocks on emptiness (pairers are event-driven), so the
+        # future/waiter machinery of asyncio.Queue is pure overhead here.
+        self.text_queue: deque[int] = deque()
+        self.voice_queue: deque[int] = deque()
         self.waiting_rooms: Dict[int, discord.Thread] = {}
-        self.active_sessions: Dict[int, Dict] = {}
-        self.queued_users = set()
+        self.active_sessions: Dict[int, Session] = {}
+        self.user_cache: Dict[int, discord.User] = {}
+        # user id -> mode, so cancellation knows which queue holds the entry
+        self.queued_users: Dict[int, str] = {}
+        # One tombstone set per queue: a shared set would let a text
+        # cancellation eat a later voice enqueue (and vice versa).
+        self.cancelled_text: set[int] = set()
+        self.cancelled_voice: set[int] = set()
         self.active_threads: Dict[str, discord.Thread] = {}
+        # thread id -> ("session", session_id) | ("waiting", user_id)
+        self.thread_index: Dict[int, tuple[str, object]] = {}
+        self.session_users: Dict[str, tuple[int, int]] = {}
         self.active_voice: Dict[str, discord.VoiceChannel] = {}
-        self.user_timeouts: Dict[int, asyncio.Task] = {}
+        # (deadline, user_id, waiting-room thread id); the thread id ties the
+        # entry to one specific search so stale entries can't fire against a
+        # re-created waiting room.
+        self.timeout_heap: list[tuple[float, int, int]] = []
+        # (start_time, session_id) per session, naturally ordered since
+        # start_time is monotonic — cleanup only inspects the front.
+        # Keyed by session id, not user id: user ids alias across sessions.
+        self.session_expiry: deque[tuple[float, str]] = deque()
+        # (not-before deadline, channel/thread) consumed by the delete workers
+        self.delete_queue: asyncio.Queue = asyncio.Queue()
+        self.text_ready = asyncio.Event()
+        self.voice_ready = asyncio.Event()
         self.session_counter = itertools.count(1)
         self.session_lock = asyncio.Lock()
-        self.queue_lock = asyncio.Lock()
         self.menu_message: Optional[discord.Message] = None
+        self.last_menu_sig: Optional[tuple] = None
+        self.menu_embed_base: dict = {}
+        # Resolved once in on_ready so session paths skip the cache lookups
+        self.channel: Optional[discord.TextChannel] = None
+        self.guild: Optional[discord.Guild] = None
+        self.category: Optional[discord.CategoryChannel] = None
+        self.background_tasks: list[asyncio.Task] = []
 
     def is_in_session(self, user_id: int) -> bool: return user_id in self.active_sessions
     def is_in_queue(self, user_id: int) -> bool: return user_id in self.queued_users
     def get_partner(self, user_id: int) -> Optional[int]:
-        s = self.active_sessions.get(user_id); return s['partner'] if s else None
-    def create_session_id(self) -> str: return f"#{next(self.session_counter):04d}"
-
-    def register_timeout(self, user_id: int, timeout: float, callback):
-        self.cancel_timeout(user_id)
-        async def timeout_wrapper():
-            try:
-                await asyncio.sleep(timeout)
-                await callback(user_id)
-            except asyncio.CancelledError:
-                pass
-            except Exception as e:
-                log.error(f"Timeout task failed: {e}")
-            finally:
-                with suppress(KeyError): del self.user_timeouts[user_id]
-        self.user_timeouts[user_id] = asyncio.create_task(timeout_wrapper())
-
-    def cancel_timeout(self, user_id: int):
-        task = self.user_timeouts.pop(user_id, None)
-        if task: task.cancel()
+        s = self.active_sessions.get(user_id); return s.partner if s else None
+    # Interned: the id keys active_threads/active_voice/session_users, so
+    # later lookups hit the pointer-equality fast path.
+    def create_session_id(self) -> str: return sys.intern(f"#{next(self.session_counter):04d}")
+
+    # One thread/VC per session, so these dicts already are the session counts.
+    @property
+    def text_session_count(self) -> int: return len(self.active_threads)
+    @property
+    def voice_session_count(self) -> int: return len(self.active_voice)
 
     async def remove_from_queue(self, user_id: int):
-        self.queued_users.discard(user_id)
-        for queue in [self.text_queue, self.voice_queue]:
-            tmp = []
-            while not queue.empty():
-                with suppress(asyncio.QueueEmpty):
-                    item = queue.get_nowait()
-                    if item != user_id: tmp.append(item)
-            for item in tmp: await queue.put(item)
-        QUEUE_SIZE.labels(type="text").set(self.text_queue.qsize())
-        QUEUE_SIZE.labels(type="voice").set(self.voice_queue.qsize())
+        # Lazy deletion: leave the queued id in place and let the pairers
+        # skip-and-discard it, instead of draining and rebuilding the queue.
+        mode = self.queued_users.pop(user_id, None)
+        if mode == "text":
+            self.cancelled_text.add(user_id)
+        elif mode == "voice":
+            self.cancelled_voice.add(user_id)
+        if user_id not in self.active_sessions:
+            self.user_cache.pop(user_id, None)
+        # Compact: with a queue drained none of its tombstones can match
+        # anything, and dropping one early is harmless (pairers re-check
+        # waiting_rooms).
+        if not self.text_queue:
+            self.cancelled_text.clear()
+        if not self.voice_queue:
+            self.cancelled_voice.clear()
 
 state = SessionState()
 
@@ -118,97 +158,170 @@ class ControlPanel(ui.View):
         self.add_item(ui.Button(label="Next",  emoji="⏭️", style=ButtonStyle.primary, custom_id=f"next_{mode}"))
         self.add_item(ui.Button(label="Leave", emoji="✋", style=ButtonStyle.danger,  custom_id=f"leave_{mode}"))
 
+# The views are stateless (custom_ids carry the mode), so share one persistent
+# instance per kind instead of rebuilding buttons on every send.
+def _freeze_view(view: ui.View) -> ui.View:
+    # Memoize the wire-format payload: children never change, yet discord.py
+    # re-serializes them via to_components() on every message send.
+    payload = view.to_components()
+    view.to_components = lambda: payload
+    return view
+
+OMEGLE_MENU   = _freeze_view(OmegleMenu())
+WAITING_VIEW  = _freeze_view(WaitingRoomView())
+TEXT_CONTROL  = _freeze_view(ControlPanel("text"))
+VOICE_CONTROL = _freeze_view(ControlPanel("voice"))
+
 # ── Waiting rooms / sessions ─────────────────────────────────────────────────
+# Static parts of the per-session embeds, built once; only the dynamic
+# title/description fields are patched in per send.
+_CHAT_EMBED_TEMPLATE    = {"color": 0x2ECC71, "description": "You're now connected! Say hello 👋"}
+_VOICE_EMBED_TEMPLATE   = {"color": 0x3498DB}
+_WAITING_EMBED_COLOR    = 0xF1C40F
+
+async def resolve_user(user_id: int) -> discord.User:
+    """Return the User who clicked/queued without an HTTP round-trip when possible."""
+    user = state.user_cache.get(user_id) or bot.get_user(user_id)
+    return user or await bot.fetch_user(user_id)
+
+async def resolve_member(user_id: int) -> discord.Member:
+    """Prefer the gateway member cache (members intent is on) over a REST fetch."""
+    member = state.guild.get_member(user_id)
+    return member or await state.guild.fetch_member(user_id)
+
+
 async def create_waiting_room(user: discord.User, mode: str) -> discord.Thread:
-    channel: discord.TextChannel = bot.get_channel(CHANNEL_ID)
-    thread = await channel.create_thread(
+    thread = await state.channel.create_thread(
         name=f"{user.name}'s {mode} waiting room",
         type=discord.ChannelType.private_thread,
         reason=f"{mode.capitalize()} matchmaking for {user.name}",
         invitable=False,
         auto_archive_duration=60
     )
+    state.thread_index[thread.id] = ("waiting", user.id)
     await thread.add_user(user)
     embed = Embed(
         title=f"🔍 Searching for {mode} partner...",
         description=(
             "Please wait while we find you someone to chat with\n\n"
             f"• Timeout: <t:{int(time.time() + TIMEOUT_SECONDS)}:R>\n"
-            f"• Text queue: **{state.text_queue.qsize()}** users\n"
-            f"• Voice queue: **{state.voice_queue.qsize()}** users\n\n"
+            f"• Text queue: **{len(state.text_queue)}** users\n"
+            f"• Voice queue: **{len(state.voice_queue)}** users\n\n"
             "• Cancel anytime using the button below"
         ),
-        color=0xF1C40F
+        color=_WAITING_EMBED_COLOR
     )
-    await thread.send(embed=embed, view=WaitingRoomView())
+    await thread.send(embed=embed, view=WAITING_VIEW)
     log.info(f"Created waiting room for {user.id} ({mode})")
     return thread
 
+DELETE_WORKERS = 4    # concurrency cap for channel/thread deletions (rate-limit friendly)
+DELETE_SPACING = 0.2  # pause after each delete so mass teardown can't burst into 429s
+
+def schedule_delete(obj, delay: float = 0.0):
+    """Queue a channel/thread deletion; delay lets users read a parting message."""
+    state.delete_queue.put_nowait((time.monotonic() + delay, obj))
+
+async def delete_worker():
+    """Drain state.delete_queue so teardown paths never wait on Discord DELETEs."""
+    while True:
+        deadline, obj = await state.delete_queue.get()
+        await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+        with suppress(discord.HTTPException):
+            await obj.delete()
+        await asyncio.sleep(DELETE_SPACING)
+
+async def timeout_loop():
+    """Single timer wheel for every search timeout.
+
+    One background task polls a (deadline, user_id, thread_id) min-heap
+    instead of one sleeping coroutine per queued user. Cancellation is
+    implicit: an entry only fires if the user's waiting room is still the
+    one the entry was pushed for — cancel-and-retry within the timeout
+    window replaces the room, which orphans the old entry.
+    """
+    heap = state.timeout_heap
+    while True:
+        now = time.monotonic()
+        while heap and heap[0][0] <= now:
+            _, uid, thread_id = heapq.heappop(heap)
+            room = state.waiting_rooms.get(uid)
+            if room is not None and room.id == thread_id:
+                with suppress(Exception):
+                    await handle_search_timeout(uid)
+        delay = min(1.0, max(0.0, heap[0][0] - time.monotonic())) if heap else 1.0
+        await asyncio.sleep(delay)
+
 async def handle_search_timeout(user_id: int):
     log.info(f"Search timeout for {user_id}")
     thread = state.waiting_rooms.get(user_id)
-    state.cancel_timeout(user_id)
     if not thread: return
     try:
         with suppress(Exception):
             await thread.send(embed=Embed(title="⏰ Search Timed Out", description="We couldn't find a partner in time. Please try again later!", color=0xE74C3C))
-            await asyncio.sleep(2)
-            await thread.delete()
+            schedule_delete(thread, delay=2.0)
     except Forbidden:
         log.warning(f"Forbidden deleting waiting thread for {user_id}")
     except discord.HTTPException as e:
         log.error(f"Timeout cleanup failed: {e}", exc_info=True)
     finally:
         state.waiting_rooms.pop(user_id, None)
+        state.thread_index.pop(thread.id, None)
         await state.remove_from_queue(user_id)
 
 async def start_session(user1: int, user2: int, mode: str):
     log.info(f"Starting {mode} session between {user1} and {user2}")
     for uid in (user1, user2):
         th = state.waiting_rooms.pop(uid, None)
-        state.cancel_timeout(uid)
-        state.queued_users.discard(uid)
-        with suppress(discord.HTTPException):
-            if th: await th.delete()
+        state.queued_users.pop(uid, None)
+        if th:
+            state.thread_index.pop(th.id, None)
+            schedule_delete(th)
     session_id = state.create_session_id()
-    start_time = time.time()
+    start_time = time.monotonic()  # wall clock can jump; only elapsed time matters here
     if mode == "text":
         await create_text_session(user1, user2, session_id, start_time)
     else:
         await create_voice_session(user1, user2, session_id, start_time)
 
 async def create_text_session(user1: int, user2: int, session_id: str, start_time: float):
-    channel: discord.TextChannel = bot.get_channel(CHANNEL_ID)
+    thread = None
     try:
-        thread = await channel.create_thread(
+        thread = await state.channel.create_thread(
             name=f"Chat {session_id}",
             type=discord.ChannelType.private_thread,
             invitable=False,
             auto_archive_duration=60
         )
+        u1, u2 = await asyncio.gather(resolve_user(user1), resolve_user(user2))
+        await asyncio.gather(thread.add_user(u1), thread.add_user(u2))
         for uid, partner in ((user1, user2), (user2, user1)):
-            user = await bot.fetch_user(uid)
-            await thread.add_user(user)
-            state.active_sessions[uid] = {
-                "partner": partner, "thread": thread, "start_time": start_time, "mode": "text", "session_id": session_id
-            }
+            state.active_sessions[uid] = Session(partner=partner, mode="text", session_id=session_id, start_time=start_time, thread=thread)
         state.active_threads[session_id] = thread
-        await thread.send(embed=Embed(title=f"💬 Chat Session {session_id}", description="You're now connected! Say hello 👋", color=0x2ECC71), view=ControlPanel("text"))
+        state.thread_index[thread.id] = ("session", session_id)
+        state.session_users[session_id] = (user1, user2)
+        state.session_expiry.append((start_time, session_id))
+        await thread.send(embed=Embed.from_dict({**_CHAT_EMBED_TEMPLATE, "title": f"💬 Chat Session {session_id}"}), view=TEXT_CONTROL)
         CHAT_SESSIONS.inc()
-        ACTIVE_THREADS_G.set(len(state.active_threads))
         log.info(f"Started TEXT session {session_id} between {user1} and {user2}")
     except discord.HTTPException as e:
         log.error(f"Text session creation failed: {e}")
-        for uid in (user1, user2): state.active_sessions.pop(uid, None); state.queued_users.discard(uid)
+        # Both users already left queued_users in start_session; only the
+        # session registration needs rolling back.
+        for uid in (user1, user2): state.active_sessions.pop(uid, None)
+        if thread is not None:
+            state.active_threads.pop(session_id, None)
+            state.thread_index.pop(thread.id, None)
+            state.session_users.pop(session_id, None)
+            schedule_delete(thread)  # don't leave an orphaned thread behind
 
 async def create_voice_session(user1: int, user2: int, session_id: str, start_time: float):
-    guild = bot.get_guild(GUILD_ID)
+    guild = state.guild
     if not guild: return log.error("Guild not found for voice session")
-    base_chan = bot.get_channel(CHANNEL_ID)
-    category = base_chan.category if isinstance(base_chan, discord.TextChannel) else None
+    category = state.category
+    vc = None
     try:
-        m1 = await guild.fetch_member(user1)
-        m2 = await guild.fetch_member(user2)
+        m1, m2 = await asyncio.gather(resolve_member(user1), resolve_member(user2))
         overwrites = {
             guild.default_role: PermissionOverwrite(connect=False, view_channel=False),
             m1: PermissionOverwrite(connect=True, view_channel=True),
@@ -216,110 +329,146 @@ async def create_voice_session(user1: int, user2: int, session_id: str, start_ti
         }
         vc = await guild.create_voice_channel(name=f"Voice {session_id}", category=category, user_limit=2, bitrate=96000, overwrites=overwrites)
         for uid, partner in ((user1, user2), (user2, user1)):
-            state.active_sessions[uid] = {
-                "partner": partner, "vc": vc, "start_time": start_time, "mode": "voice", "session_id": session_id
-            }
+            state.active_sessions[uid] = Session(partner=partner, mode="voice", session_id=session_id, start_time=start_time, vc=vc)
         state.active_voice[session_id] = vc
+        state.session_users[session_id] = (user1, user2)
+        state.session_expiry.append((start_time, session_id))
         invite = await vc.create_invite(max_uses=2, unique=True)
-        embed = Embed(title=f"🎙️ Voice Session {session_id}", description=f"Private voice channel ready: **{vc.name}**\n\nClick below to join:", color=0x3498DB)
-        for uid in (user1, user2):
+        embed = Embed.from_dict({
+            **_VOICE_EMBED_TEMPLATE,
+            "title": f"🎙️ Voice Session {session_id}",
+            "description": f"Private voice channel ready: **{vc.name}**\n\nClick below to join:",
+        })
+        async def send_invite(uid: int):
             with suppress(Forbidden, Exception):
-                user = await bot.fetch_user(uid)
-                await user.send(embed=embed, view=ControlPanel("voice"), content=f"Join voice: {invite.url}")
+                user = await resolve_user(uid)
+                await user.send(embed=embed, view=VOICE_CONTROL, content=f"Join voice: {invite.url}")
+        # return_exceptions so one closed-DM user doesn't cancel the other's invite
+        await asyncio.gather(send_invite(user1), send_invite(user2), return_exceptions=True)
         VOICE_SESSIONS.inc()
-        ACTIVE_VOICE_G.set(len(state.active_voice))
         log.info(f"Started VOICE session {session_id} between {user1} and {user2}")
     except discord.HTTPException as e:
         log.error(f"Voice session creation failed: {e}")
-        for uid in (user1, user2): state.active_sessions.pop(uid, None); state.queued_users.discard(uid)
+        # Both users already left queued_users in start_session; only the
+        # session registration needs rolling back.
+        for uid in (user1, user2): state.active_sessions.pop(uid, None)
+        if vc is not None:
+            state.active_voice.pop(session_id, None)
+            state.session_users.pop(session_id, None)
+            schedule_delete(vc)  # don't leave an orphaned voice channel behind
 
 async def end_session(user_id: int, reason: str):
+    # Double-checked: uncontended callers skip the lock entirely, and the
+    # membership is re-validated (via pop) once it's held.
+    if user_id not in state.active_sessions: return
+    th = vc = None
     async with state.session_lock:
-        if user_id not in state.active_sessions: return
-        s = state.active_sessions.pop(user_id)
-        partner_id = s.get("partner")
-        mode = s["mode"]
-        session_id = s.get("session_id", "")
-        SESSION_DURATION.observe(time.time() - s["start_time"])
-        if partner_id in state.active_sessions: state.active_sessions.pop(partner_id, None)
-
-        if mode == "text":
-            th: discord.Thread = s.get("thread")
-            if th:
-                with suppress(Exception): await th.send(f"✋ <@{user_id}> has left. Deleting thread...")
-                with suppress(discord.HTTPException): await th.delete()
+        s = state.active_sessions.pop(user_id, None)
+        if s is None: return  # partner's end_session won the race
+        partner_id = s.partner
+        session_id = s.session_id
+        SESSION_DURATION.observe(time.monotonic() - s.start_time)
+        state.active_sessions.pop(partner_id, None)
+        state.user_cache.pop(user_id, None)
+        state.user_cache.pop(partner_id, None)
+        state.session_users.pop(session_id, None)
+        if s.mode == "text":
+            th = s.thread
+            if th: state.thread_index.pop(th.id, None)
             state.active_threads.pop(session_id, None)
-            ACTIVE_THREADS_G.set(len(state.active_threads))
         else:
-            vc: discord.VoiceChannel = s.get("vc")
-            if vc:
-                with suppress(discord.HTTPException):
-                    await vc.delete()
+            vc = s.vc
             state.active_voice.pop(session_id, None)
-            ACTIVE_VOICE_G.set(len(state.active_voice))
+    # Discord I/O happens after the lock is released; only the dict mutations
+    # above need mutual exclusion.
+    if th:
+        with suppress(Exception): await th.send(f"✋ <@{user_id}> has left. Deleting thread...")
+        schedule_delete(th)
+    elif vc:
+        schedule_delete(vc)
 
 
 # ── Queue ─────────────────────────────────────────────────────────────────────
-async def enqueue_user(user_id: int, mode: str) -> bool:
+async def enqueue_user(user: discord.User, mode: str) -> bool:
+    user_id = user.id
     if state.is_in_session(user_id) or state.is_in_queue(user_id): return False
+    # Reserve the slot before awaiting anything so a double-click while the
+    # waiting room is being created can't enqueue the user twice.
+    state.queued_users[user_id] = mode
+    state.user_cache[user_id] = user
     try:
-        user = await bot.fetch_user(user_id)
         thread = await create_waiting_room(user, mode)
         state.waiting_rooms[user_id] = thread
     except Exception as e:
         log.error(f"Failed to create waiting room: {e}")
+        state.queued_users.pop(user_id, None)
+        state.user_cache.pop(user_id, None)
         return False
 
     queue = state.text_queue if mode == "text" else state.voice_queue
-    async with state.queue_lock:
-        state.queued_users.add(user_id)
-        await queue.put(user_id)
-        QUEUE_SIZE.labels(type=mode).set(queue.qsize())
+    ready = state.text_ready if mode == "text" else state.voice_ready
+    queue.append(user_id)
+    if len(queue) >= 2:
+        ready.set()
 
-    state.register_timeout(user_id, TIMEOUT_SECONDS, handle_search_timeout)
+    heapq.heappush(state.timeout_heap, (time.monotonic() + TIMEOUT_SECONDS, user_id, thread.id))
     log.info(f"Enqueued {user_id} for {mode}")
     return True
 
 # ── Pairers (do heavy work outside locks) ─────────────────────────────────────
-@tasks.loop(seconds=PAIR_INTERVAL)
-async def text_pairer():
-    pairs = []
-    async with state.queue_lock:
-        while state.text_queue.qsize() >= 2:
-            u1 = await state.text_queue.get()
-            u2 = await state.text_queue.get()
-            v1 = u1 in state.waiting_rooms
-            v2 = u2 in state.waiting_rooms
-            if v1 and v2:
-                pairs.append((u1, u2))
-            else:
-                if v1: await state.text_queue.put(u1)
-                else: await state.remove_from_queue(u1)
-                if v2: await state.text_queue.put(u2)
-                else: await state.remove_from_queue(u2)
-    for u1, u2 in pairs:
+pair_semaphore = asyncio.Semaphore(8)  # cap concurrent session setups (Discord rate limits)
+
+async def run_session(user1: int, user2: int, mode: str):
+    async with pair_semaphore:
         with suppress(Exception):
-            await start_session(u1, u2, "text")
-
-@tasks.loop(seconds=PAIR_INTERVAL)
-async def voice_pairer():
-    pairs = []
-    async with state.queue_lock:
-        while state.voice_queue.qsize() >= 2:
-            u1 = await state.voice_queue.get()
-            u2 = await state.voice_queue.get()
+            await start_session(user1, user2, mode)
+
+PAIRER_RESCAN_SECONDS = 30.0  # safety net in case a ready signal is ever missed
+
+async def pairer_loop(mode: str, queue: deque, ready: asyncio.Event, cancelled: set[int]):
+    while True:
+        # Edge-triggered: enqueue_user sets the event the moment a second user
+        # is available, so matches happen immediately instead of on a poll tick.
+        with suppress(TimeoutError):
+            async with asyncio.timeout(PAIRER_RESCAN_SECONDS):
+                await ready.wait()
+        ready.clear()
+        # No lock: everything here runs between awaits on one event loop, and
+        # the queue's own operations are the only synchronization needed.
+        pairs = []
+        while len(queue) >= 2:
+            u1 = queue.popleft()
+            if u1 in cancelled:
+                cancelled.discard(u1)
+                # Still in queued_users means the tombstone is stale (the user
+                # cancelled after this id left the deque, then re-enqueued);
+                # this entry is their live search, so don't eat it.
+                if u1 not in state.queued_users:
+                    continue
+            u2 = queue.popleft()
+            if u2 in cancelled:
+                cancelled.discard(u2)
+                if u2 not in state.queued_users:
+                    queue.appendleft(u1)  # keep the valid user at the front
+                    continue
             v1 = u1 in state.waiting_rooms
             v2 = u2 in state.waiting_rooms
             if v1 and v2:
                 pairs.append((u1, u2))
             else:
-                if v1: await state.voice_queue.put(u1)
-                else: await state.remove_from_queue(u1)
-                if v2: await state.voice_queue.put(u2)
-                else: await state.remove_from_queue(u2)
-    for u1, u2 in pairs:
-        with suppress(Exception):
-            await start_session(u1, u2, "voice")
+                # Invalid ids are already out of the queue; just drop them,
+                # evicting the user cache like remove_from_queue does.
+                for uid, valid in ((u1, v1), (u2, v2)):
+                    if valid:
+                        queue.appendleft(uid)
+                    else:
+                        state.queued_users.pop(uid, None)
+                        if uid not in state.active_sessions:
+                            state.user_cache.pop(uid, None)
+        # Session setup (thread creation, fetches) runs concurrently so text
+        # and voice pairing never block each other.
+        for u1, u2 in pairs:
+            asyncio.create_task(run_session(u1, u2, mode))
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 async def safe_respond(inter: Interaction, content: str, ephemeral: bool = True):
@@ -341,30 +490,39 @@ async def safe_respond(inter: Interaction, content: str, ephemeral: bool = True)
 async def handle_start(inter: Interaction, mode: str):
     if state.is_in_session(inter.user.id):
         await safe_respond(inter, "❗ You're already in a session."); return
-    if await enqueue_user(inter.user.id, mode):
+    if await enqueue_user(inter.user, mode):
         await safe_respond(inter, "🔎 Searching for a partner... Check your private thread!")
     else:
         await safe_respond(inter, "ℹ️ You're already in a queue or session.")
 
 async def handle_leave(inter: Interaction, mode: str):
     uid = inter.user.id
-    if uid in state.waiting_rooms:
-        th = state.waiting_rooms.pop(uid, None)
+    th = state.waiting_rooms.pop(uid, None)
+    if th is not None:
+        state.thread_index.pop(th.id, None)
         with suppress(Exception):
-            if th: await th.send("❌ Search cancelled by user"); await asyncio.sleep(1.5); await th.delete()
-        state.cancel_timeout(uid)
+            await th.send("❌ Search cancelled by user"); schedule_delete(th, delay=1.5)
         await state.remove_from_queue(uid)
-    if uid in state.active_sessions: await end_session(uid, "User left")
+    await end_session(uid, "User left")  # no-op if not in a session
     await safe_respond(inter, "✅ You've left the session/queue")
 
 async def handle_next(inter: Interaction, mode: str):
-    uid = inter.user.id
-    if uid in state.active_sessions: await end_session(uid, "Next")
+    await end_session(inter.user.id, "Next")
     await handle_start(inter, mode)
 
 async def handle_cancel(inter: Interaction):
     await handle_leave(inter, "text")
 
+_BUTTON_HANDLERS = {
+    "start_text":    lambda i: handle_start(i, "text"),
+    "start_voice":   lambda i: handle_start(i, "voice"),
+    "cancel_search": handle_cancel,
+    "leave_text":    lambda i: handle_leave(i, "text"),
+    "leave_voice":   lambda i: handle_leave(i, "voice"),
+    "next_text":     lambda i: handle_next(i, "text"),
+    "next_voice":    lambda i: handle_next(i, "voice"),
+}
+
 @bot.event
 async def on_interaction(inter: Interaction):
     if inter.type != discord.InteractionType.component:
@@ -389,13 +547,8 @@ async def on_interaction(inter: Interaction):
 
     async def _handle():
         try:
-            if   cid == "start_text":   await handle_start(inter, "text")
-            elif cid == "start_voice":  await handle_start(inter, "voice")
-            elif cid == "cancel_search":await handle_cancel(inter)
-            elif cid == "leave_text":   await handle_leave(inter, "text")
-            elif cid == "leave_voice":  await handle_leave(inter, "voice")
-            elif cid == "next_text":    await handle_next(inter, "text")
-            elif cid == "next_voice":   await handle_next(inter, "voice")
+            handler = _BUTTON_HANDLERS.get(cid)
+            if handler: await handler(inter)
         except Exception as e:
             log.error(f"Error handling interaction {cid}: {e}", exc_info=True)
             # Best-effort notify if still valid
@@ -415,21 +568,21 @@ async def slash_call(inter: Interaction): await handle_start(inter, "voice")
 
 @bot.tree.command(name="leave", description="Leave your current session")
 async def slash_leave(inter: Interaction):
-    mode = state.active_sessions.get(inter.user.id, {}).get("mode", "text")
-    await handle_leave(inter, mode)
+    s = state.active_sessions.get(inter.user.id)
+    await handle_leave(inter, s.mode if s else "text")
 
 @bot.tree.command(name="stats", description="Show bot statistics")
 async def slash_stats(inter: Interaction):
-    text_sessions  = len([s for s in state.active_sessions.values() if s.get('mode') == "text"]) // 2
-    voice_sessions = len([s for s in state.active_sessions.values() if s.get('mode') == "voice"]) // 2
+    text_sessions  = state.text_session_count
+    voice_sessions = state.voice_session_count
     embed = Embed(
         title="📊 Omegle Bot Stats",
         color=0x3498DB,
         description=(
             f"Active text sessions: **{text_sessions}**\n"
             f"Active voice sessions: **{voice_sessions}**\n"
-            f"Text queue length: **{state.text_queue.qsize()}**\n"
-            f"Voice queue length: **{state.voice_queue.qsize()}**\n"
+            f"Text queue length: **{len(state.text_queue)}**\n"
+            f"Voice queue length: **{len(state.voice_queue)}**\n"
             f"Total queued users: **{len(state.queued_users)}**"
         )
     )
@@ -439,74 +592,109 @@ async def slash_stats(inter: Interaction):
 @bot.event
 async def on_thread_update(before: discord.Thread, after: discord.Thread):
     if not after.archived: return
-    for session_id, thread in list(state.active_threads.items()):
-        if thread.id == after.id:
-            for user_id, s in list(state.active_sessions.items()):
-                if s.get("thread") and s["thread"].id == after.id:
-                    await end_session(user_id, "Thread archived")
-            return
-    for user_id, thread in list(state.waiting_rooms.items()):
-        if thread.id == after.id:
-            with suppress(Exception): await after.delete()
-            state.waiting_rooms.pop(user_id, None)
-            await state.remove_from_queue(user_id)
-            return
+    entry = state.thread_index.get(after.id)
+    if entry is None: return
+    kind, key = entry
+    if kind == "session":
+        users = state.session_users.get(key)
+        if users:
+            # end_session tears down the partner's entry too
+            await end_session(users[0], "Thread archived")
+    else:
+        state.thread_index.pop(after.id, None)
+        schedule_delete(after)
+        state.waiting_rooms.pop(key, None)
+        await state.remove_from_queue(key)
 
 @tasks.loop(seconds=CLEANUP_INTERVAL)
 async def cleanup_stale():
     log.debug("Running cleanup task")
-    for user_id, thread in list(state.waiting_rooms.items()):
-        try:
-            fresh = await bot.fetch_channel(thread.id)
-            if isinstance(fresh, discord.Thread) and (fresh.archived or fresh.locked):
-                with suppress(Exception): await fresh.delete()
-                state.waiting_rooms.pop(user_id, None)
-                await state.remove_from_queue(user_id)
-                log.info(f"Cleaned up archived waiting room for {user_id}")
-        except discord.NotFound:
+    # Fan the channel fetches out in parallel; the serial version held the
+    # loop for one round-trip per waiting room.
+    rooms = list(state.waiting_rooms.items())
+    results = await asyncio.gather(*(bot.fetch_channel(th.id) for _, th in rooms), return_exceptions=True)
+    for (user_id, thread), fresh in zip(rooms, results):
+        if isinstance(fresh, discord.NotFound):
             state.waiting_rooms.pop(user_id, None)
+            state.thread_index.pop(thread.id, None)
             await state.remove_from_queue(user_id)
-        except Exception as e:
-            log.error(f"Cleanup failed for waiting room {user_id}: {e}")
-
-    now = time.time()
+        elif isinstance(fresh, BaseException):
+            log.error(f"Cleanup failed for waiting room {user_id}: {fresh}")
+        elif isinstance(fresh, discord.Thread) and (fresh.archived or fresh.locked):
+            schedule_delete(fresh)
+            state.waiting_rooms.pop(user_id, None)
+            state.thread_index.pop(thread.id, None)
+            await state.remove_from_queue(user_id)
+            log.info(f"Cleaned up archived waiting room for {user_id}")
+
+    now = time.monotonic()
+    # Expire sessions from the front of the time-ordered deque instead of
+    # scanning every active session; entries whose session already ended
+    # (or never fully started) resolve to nothing and are simply skipped.
+    expiry = state.session_expiry
+    while expiry and now - expiry[0][0] > 3600:
+        _, session_id = expiry.popleft()
+        users = state.session_users.get(session_id)
+        if users:
+            # end_session tears down the partner's entry too
+            await end_session(users[0], "Session expired (timeout)")
+
+    # Voice liveness needs no fetch; text thread checks are batched, one
+    # fetch per session rather than per user.
+    seen_threads: set[int] = set()
+    text_items = []
     for user_id, s in list(state.active_sessions.items()):
         try:
-            if now - s["start_time"] > 3600:
-                await end_session(user_id, "Session expired (timeout)")
-                continue
-            if s.get("mode") == "text":
-                th = s.get("thread")
-                if th:
-                    fresh = await bot.fetch_channel(th.id)
-                    if isinstance(fresh, discord.Thread) and (fresh.archived or fresh.locked):
-                        await end_session(user_id, "Session expired")
+            if s.mode == "text":
+                if s.thread and s.thread.id not in seen_threads:
+                    seen_threads.add(s.thread.id)
+                    text_items.append((user_id, s.thread))
             else:
-                vc = s.get("vc")
+                vc = s.vc
                 if vc and len(vc.members) == 0:
                     await end_session(user_id, "Voice channel empty")
         except Exception as e:
             log.error(f"Cleanup failed for user {user_id}: {e}")
 
+    results = await asyncio.gather(*(bot.fetch_channel(th.id) for _, th in text_items), return_exceptions=True)
+    for (user_id, th), fresh in zip(text_items, results):
+        if isinstance(fresh, BaseException):
+            log.error(f"Cleanup failed for user {user_id}: {fresh}")
+        elif isinstance(fresh, discord.Thread) and (fresh.archived or fresh.locked):
+            await end_session(user_id, "Session expired")
+
+def build_menu_embed() -> Embed:
+    # Static fields live in menu_embed_base (built once in on_ready); only
+    # the description changes between ticks.
+    d = dict(state.menu_embed_base)
+    d["description"] = (
+        "Pick one to begin!\n\n"
+        f"• Active text sessions: **{state.text_session_count}**\n"
+        f"• Active voice sessions: **{state.voice_session_count}**\n\n"
+        f"• Text queue: **{len(state.text_queue)}** users waiting\n"
+        f"• Voice queue: **{len(state.voice_queue)}** users waiting"
+    )
+    return Embed.from_dict(d)
+
+def refresh_gauges():
+    """Publish the canonical counts once per tick instead of on every mutation."""
+    QUEUE_SIZE_TEXT.set(len(state.text_queue))
+    QUEUE_SIZE_VOICE.set(len(state.voice_queue))
+    ACTIVE_THREADS_G.set(len(state.active_threads))
+    ACTIVE_VOICE_G.set(len(state.active_voice))
+
 @tasks.loop(seconds=5.0)
 async def update_menu_task():
+    refresh_gauges()
     if not state.menu_message: return
-    text_sessions  = len([s for s in state.active_sessions.values() if s.get('mode') == "text"]) // 2
-    voice_sessions = len([s for s in state.active_sessions.values() if s.get('mode') == "voice"]) // 2
-    embed = Embed(
-        title="🔌 Omegle-Style Chat",
-        description=(
-            "Pick one to begin!\n\n"
-            f"• Active text sessions: **{text_sessions}**\n"
-            f"• Active voice sessions: **{voice_sessions}**\n\n"
-            f"• Text queue: **{state.text_queue.qsize()}** users waiting\n"
-            f"• Voice queue: **{state.voice_queue.qsize()}** users waiting"
-        ),
-        color=0x5865F2,
-    )
-    if bot.user: embed.set_thumbnail(url=bot.user.display_avatar.url)
+    sig = (state.text_session_count, state.voice_session_count, len(state.text_queue), len(state.voice_queue))
+    if sig == state.last_menu_sig: return  # nothing changed; skip the API round-trip
+    embed = build_menu_embed()
     try:
         await state.menu_message.edit(embed=embed)
+        # Record the signature only once the edit lands, so a transient
+        # failure retries next tick instead of leaving the menu stale.
+        state.last_menu_sig = sig
     except discord.errors.NotFound:
         log.warning("Menu message not found; stopping updates."); update_menu_task.cancel()
     except Exception as e:
@@ -515,29 +703,20 @@ async def update_menu_task():
 @bot.event
 async def on_ready():
     log.info(f"Logged in as {bot.user} ({bot.user.id})")
+    channel: discord.TextChannel = bot.get_channel(CHANNEL_ID)
+    state.channel = channel
+    state.guild = bot.get_guild(GUILD_ID)
+    state.category = channel.category if isinstance(channel, discord.TextChannel) else None
+    state.menu_embed_base = {"title": "🔌 Omegle-Style Chat", "color": 0x5865F2}
+    if bot.user: state.menu_embed_base["thumbnail"] = {"url": bot.user.display_avatar.url}
     try:
-        channel: discord.TextChannel = bot.get_channel(CHANNEL_ID)
         if channel:
             await channel.purge(limit=10, check=lambda m: m.author == bot.user)
-            text_sessions  = len([s for s in state.active_sessions.values() if s.get('mode') == "text"]) // 2
-            voice_sessions = len([s for s in state.active_sessions.values() if s.get('mode') == "voice"]) // 2
-            embed = Embed(
-                title="🔌 Omegle-Style Chat",
-                description=(
-                    "Pick one to begin!\n\n"
-                    f"• Active text sessions: **{text_sessions}**\n"
-                    f"• Active voice sessions: **{voice_sessions}**\n\n"
-                    f"• Text queue: **{state.text_queue.qsize()}** users waiting\n"
-                    f"• Voice queue: **{state.voice_queue.qsize()}** users waiting"
-                ),
-                color=0x5865F2,
-            )
-            if bot.user: embed.set_thumbnail(url=bot.user.display_avatar.url)
-            state.menu_message = await channel.send(embed=embed, view=OmegleMenu())
+            state.menu_message = await channel.send(embed=build_menu_embed(), view=OMEGLE_MENU)
     except Exception as e:
         log.error(f"Failed to setup menu: {e}")
 
-    bot.add_view(OmegleMenu()); bot.add_view(WaitingRoomView()); bot.add_view(ControlPanel("text")); bot.add_view(ControlPanel("voice"))
+    bot.add_view(OMEGLE_MENU); bot.add_view(WAITING_VIEW); bot.add_view(TEXT_CONTROL); bot.add_view(VOICE_CONTROL)
 
     try:
         await bot.tree.sync(guild=discord.Object(id=GUILD_ID))
@@ -545,7 +724,13 @@ async def on_ready():
     except Exception as e:
         log.error(f"Command sync failed: {e}")
 
-    text_pairer.start(); voice_pairer.start(); cleanup_stale.start(); update_menu_task.start()
+    if not state.background_tasks:
+        state.background_tasks.append(asyncio.create_task(pairer_loop("text", state.text_queue, state.text_ready, state.cancelled_text)))
+        state.background_tasks.append(asyncio.create_task(pairer_loop("voice", state.voice_queue, state.voice_ready, state.cancelled_voice)))
+        state.background_tasks.append(asyncio.create_task(timeout_loop()))
+        for _ in range(DELETE_WORKERS):
+            state.background_tasks.append(asyncio.create_task(delete_worker()))
+    cleanup_stale.start(); update_menu_task.start()
     log.info("Bot ready")
 
 @bot.event